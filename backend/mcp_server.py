@@ -22,8 +22,19 @@ KEY CONCEPTS:
 """
 
 from flask import Flask, request, jsonify
-from flask_cors import CORS
+import atexit
+import hashlib
+import numpy as np
+import orjson
+import pickle
+import re
+import queue
 import sqlite3
+import threading
+import time
+from cachetools import TTLCache
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import Future
 import chromadb
 from chromadb.utils import embedding_functions
 import os
@@ -31,7 +42,31 @@ import yaml
 from pathlib import Path
 
 app = Flask(__name__)
-CORS(app)  # Allow cross-origin requests
+
+# Static CORS headers instead of the Flask-CORS extension: its
+# after_request hook introspects origins/headers on every response, which
+# is wasted work on a high-QPS JSON-RPC endpoint with known clients.
+@app.after_request
+def _cors(resp):
+    resp.headers['Access-Control-Allow-Origin'] = '*'
+    resp.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    resp.headers['Access-Control-Allow-Methods'] = 'POST,OPTIONS,GET'
+    return resp
+
+# Preflight requests short-circuit to an empty 204
+@app.route('/mcp', methods=['OPTIONS'])
+def mcp_preflight():
+    return app.response_class(b'', status=204)
+
+def _json_response(obj, status=200):
+    """
+    Serialize a response with orjson instead of Flask's jsonify.
+
+    orjson uses SIMD-accelerated UTF-8 validation and number formatting,
+    which matters here because execute_sql responses can contain hundreds
+    of rows and this endpoint is pure CPU on the serialize path.
+    """
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
 
 # ============================================================================
 # DATABASE CONNECTIONS
@@ -41,13 +76,40 @@ import setup_database
 # Automatically initialize database on import if it doesn't exist
 setup_database.main()
 
+# One long-lived connection per worker thread (like a connection pool,
+# but SQLite connections are cheap enough that thread-local is the pool)
+_db_local = threading.local()
+
 def get_db_connection():
     """
     Get SQLite database connection
     Similar to: DataSource.getConnection() in Spring Boot
+
+    Connections are thread-local and long-lived: opening a fresh connection
+    (and creating/syncing the journal file) per query dominates the cost of
+    small SELECTs. WAL mode lets concurrent Flask threads read in parallel
+    while a writer is active.
     """
-    conn = sqlite3.connect('data/database.db', check_same_thread=False)
-    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        # cached_statements=512 (default 128): sqlite keeps prepared
+        # statements per connection, so the LLM re-issuing the same SQL
+        # pattern skips the parse/plan step
+        conn = sqlite3.connect('data/database.db', check_same_thread=False,
+                               cached_statements=512)
+        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        # Tune once per connection:
+        # - WAL: readers don't block on the writer (and vice versa)
+        # - synchronous=NORMAL: safe with WAL, skips an fsync per commit
+        # - busy_timeout: wait instead of failing on a locked database
+        # - cache_size -20000: ~20MB page cache kept hot between queries
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        _db_local.conn = conn
     return conn
 
 # Initialize ChromaDB for vector search
@@ -82,59 +144,198 @@ except Exception as e:
 # Think of each as a @PostMapping method in Spring Boot
 # ============================================================================
 
-def execute_sql(query: str = "", **kwargs) -> dict:
+# Exact-match result cache for idempotent SELECTs. The agent frequently
+# re-issues the same query within one reasoning loop (and users repeat
+# questions), so identical SELECTs within the TTL skip sqlite entirely.
+_SQL_CACHE = TTLCache(maxsize=512, ttl=60)
+_sql_cache_lock = threading.Lock()
+
+def _sql_cache_key(query: str, params=None) -> bytes:
+    """
+    Hash the guarded query verbatim (and params) so long SQL strings stay
+    cheap dict keys. No case-folding: SQLite string comparisons are
+    case-sensitive, so WHERE status='Failed' and WHERE status='failed'
+    are different queries and must not share a cache entry.
+    """
+    h = hashlib.blake2b(query.encode(), digest_size=16)
+    if params:
+        h.update(orjson.dumps(params))
+    return h.digest()
+
+# SELECTs that fill a whole first batch get streamed instead of materialized
+_STREAM_BATCH_ROWS = 500
+
+# Guard rails for LLM-generated SQL: bound both query size and result size
+# before sqlite does any real work
+_SQL_MAX_LENGTH = 10000
+_SQL_DEFAULT_LIMIT = 500
+_LIMIT_RE = re.compile(r'\blimit\s+\d+', re.IGNORECASE)
+
+def _guard_sql(query: str):
+    """
+    Pre-flight checks on LLM-generated SQL. Returns (query, error).
+
+    - only SELECT/WITH statements run (the LLM is told this, but
+      prompts are not guarantees). Single-statement enforcement is left
+      to sqlite3 itself — Cursor.execute refuses multi-statement
+      strings — because a naive semicolon scan would reject valid
+      queries whose string literals contain one (LIKE '%;%')
+    - queries without a LIMIT get wrapped with LIMIT 500 so an unbounded
+      SELECT over a big table can't blow memory or tail latency
+    """
+    stripped = query.strip().rstrip(';').strip()
+    if not stripped:
+        return None, "Empty query"
+    if len(stripped) > _SQL_MAX_LENGTH:
+        return None, f"Query too long ({len(stripped)} chars, max {_SQL_MAX_LENGTH})"
+    first_word = stripped.split(None, 1)[0].upper()
+    if first_word not in ('SELECT', 'WITH'):
+        return None, f"Only SELECT queries are allowed, got: {first_word}"
+    if not _LIMIT_RE.search(stripped):
+        stripped = f"SELECT * FROM ({stripped}) LIMIT {_SQL_DEFAULT_LIMIT}"
+    return stripped, None
+
+class StreamedSqlResult:
+    """
+    Marker returned by execute_sql for large SELECTs.
+
+    mcp_handler turns this into a chunked JSON-RPC response: rows are
+    pulled from the cursor in batches and serialized incrementally, so
+    peak memory is one batch rather than the whole result set plus its
+    JSON string. Streamed results use row-wise {"rows": [...]} shape
+    (columnar packing would require the full result up front).
+    """
+
+    def __init__(self, cursor, columns, first_batch):
+        self.cursor = cursor
+        self.columns = columns
+        self.first_batch = first_batch
+
+    def response_body(self, request_id):
+        yield (b'{"jsonrpc":"2.0","id":' + orjson.dumps(request_id)
+               + b',"result":{"success":true,"columns":' + orjson.dumps(self.columns)
+               + b',"rows":[')
+        count = 0
+        batch = self.first_batch
+        while batch:
+            for row in batch:
+                prefix = b'' if count == 0 else b','
+                yield prefix + orjson.dumps(dict(zip(self.columns, tuple(row))))
+                count += 1
+            batch = self.cursor.fetchmany(_STREAM_BATCH_ROWS)
+        self.cursor.close()
+        yield b'],"row_count":' + str(count).encode() + b'}}'
+
+def execute_sql(query: str = "", params=None, **kwargs) -> dict:
     """
     Tool: Execute SQL query on database
-    
+
     HOW IT WORKS:
     1. LLM generates SQL from natural language (e.g., "show failed tasks" → SQL)
     2. LLM calls this tool via JSON-RPC: execute_sql(query="SELECT * FROM tasks...")
     3. This function executes the SQL and returns results
     4. LLM formats results into human-readable response
-    
+
     INPUT (from LLM): {"query": "SELECT * FROM tasks WHERE status='failed'"}
-    OUTPUT: {"columns": [...], "rows": [...], "row_count": 5}
+    OUTPUT: {"columns": [...], "data": {col: [values...]}, "row_count": 5}
+
+    Repeated SELECTs are served from a short-lived (60s) exact-match cache.
+    Non-SELECT queries are rejected before touching sqlite (which
+    itself refuses multi-statement strings), and unbounded queries are
+    capped with LIMIT 500.
     """
+    query, guard_error = _guard_sql(query)
+    if guard_error:
+        return {
+            "success": False,
+            "error": guard_error
+        }
+
+    key = _sql_cache_key(query, params)
+    with _sql_cache_lock:
+        cached = _SQL_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute(query)
-        
+        cursor.execute(query, params or [])
+
         # Get column names
         columns = [description[0] for description in cursor.description]
-        
-        # Fetch all rows and convert to list of dicts
-        rows = []
-        for row in cursor.fetchall():
-            rows.append(dict(zip(columns, row)))
-        
-        conn.close()
-        
-        return {
+
+        # Large result sets never get materialized: if the first batch
+        # comes back full, hand the live cursor to a streaming wrapper
+        # that serializes row batches incrementally (and skip the cache)
+        first_batch = cursor.fetchmany(_STREAM_BATCH_ROWS)
+        if len(first_batch) == _STREAM_BATCH_ROWS:
+            return StreamedSqlResult(cursor, columns, first_batch)
+
+        # Columnar (column -> list of values) result shape. Building one
+        # dict per row costs N dict constructions and N×M hash inserts;
+        # one list per column is M list comprehensions over already-fetched
+        # tuples, and it's how the LLM/frontend consume tabular data anyway.
+        rows = first_batch
+        data = {col: [row[i] for row in rows] for i, col in enumerate(columns)}
+
+        cursor.close()  # connection stays open (thread-local, reused)
+
+        result = {
             "success": True,
             "columns": columns,
-            "rows": rows,
+            "data": data,
             "row_count": len(rows)
         }
+        with _sql_cache_lock:
+            _SQL_CACHE[key] = result
+        return result
     except Exception as e:
         return {
             "success": False,
             "error": str(e)
         }
 
+def execute_sql_parametrized(query: str = "", params=None, **kwargs) -> dict:
+    """
+    Tool: Execute a SQL query with ? placeholders and bound parameters
+
+    Using placeholders (e.g. "SELECT * FROM tasks WHERE status = ?") means
+    repeated queries that differ only in values share one entry in sqlite's
+    per-connection statement cache, so the parse/plan step is paid once.
+    """
+    return execute_sql(query=query, params=params)
+
+# Memoized schema, invalidated via SQLite's schema_version pragma.
+# The LLM is instructed to call get_database_schema before every SQL query,
+# so without this every reasoning loop pays O(tables) PRAGMA round trips.
+_SCHEMA_CACHE = {'version': None, 'value': None}
+_schema_cache_lock = threading.Lock()
+
 def get_database_schema(**kwargs) -> dict:
     """
     Tool: Get database schema (tables, columns, types)
-    
+
     HOW IT WORKS:
     - LLM calls this to understand what data is available
     - Similar to SQL's INFORMATION_SCHEMA
     - LLM uses this to generate correct SQL queries
+    - Result is cached; PRAGMA schema_version (a single O(1) read) tells us
+      when any DDL has run and the cache must be rebuilt
     """
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        
+
+        # schema_version increments whenever DDL changes the schema
+        cursor.execute("PRAGMA schema_version")
+        schema_version = cursor.fetchone()[0]
+
+        with _schema_cache_lock:
+            if _SCHEMA_CACHE['version'] == schema_version:
+                cursor.close()
+                return _SCHEMA_CACHE['value']
+
         # Get all table names
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
         tables = [row[0] for row in cursor.fetchall()]
@@ -152,18 +353,248 @@ def get_database_schema(**kwargs) -> dict:
                     "primary_key": bool(col[5])
                 })
             schema[table] = columns
-        
-        conn.close()
-        return {
+
+        cursor.close()  # connection stays open (thread-local, reused)
+        result = {
             "success": True,
             "schema": schema
         }
+        with _schema_cache_lock:
+            _SCHEMA_CACHE['version'] = schema_version
+            _SCHEMA_CACHE['value'] = result
+        return result
     except Exception as e:
         return {
             "success": False,
             "error": str(e)
         }
 
+class SemanticQueryCache:
+    """
+    Approximate-match cache for vector search queries.
+
+    Many user queries are paraphrases of each other ("login fails" vs
+    "can't sign in"). Exact-match caching misses those, but their
+    embeddings are nearly identical. So we cache (embedding, result) pairs
+    and look up new queries by cosine similarity.
+
+    To avoid scanning every cached entry, embeddings are bucketed with
+    random-projection LSH: sign of the dot product against 8 random
+    hyperplanes gives an 8-bit bucket id. Near-identical vectors land in
+    the same bucket with high probability, so a lookup only compares
+    against a handful of candidates.
+
+    Entries store the packaged document list together with the top_k it
+    was fetched with; a hit must cover the requested top_k and is sliced
+    down to it, so a paraphrase asking for more documents than the
+    original caller is a miss rather than a short answer.
+    """
+
+    def __init__(self, n_planes: int = 8, max_entries: int = 1024, threshold: float = 0.95):
+        self.n_planes = n_planes
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._planes = None  # lazily sized once we see the embedding dimension
+        self._buckets = defaultdict(list)  # bucket id -> list of [vec, result]
+        self._order = deque()  # FIFO eviction: (bucket, entry) pairs
+        self._lock = threading.Lock()
+
+    def _bucket_id(self, vec: np.ndarray) -> int:
+        if self._planes is None:
+            # Fixed seed: bucket assignment must be stable across lookups
+            rng = np.random.default_rng(0)
+            self._planes = rng.standard_normal((self.n_planes, vec.shape[0]))
+        bits = (self._planes @ vec) > 0
+        return int(np.packbits(bits)[0])
+
+    def get(self, vec: np.ndarray, top_k: int):
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+        with self._lock:
+            for entry in self._buckets.get(self._bucket_id(vec), []):
+                cached_vec, cached_top_k, documents = entry
+                if cached_top_k < top_k:
+                    continue
+                sim = float(vec @ cached_vec) / (norm * np.linalg.norm(cached_vec))
+                if sim >= self.threshold:
+                    return documents[:top_k]
+        return None
+
+    def put(self, vec: np.ndarray, top_k: int, documents: list):
+        with self._lock:
+            bucket = self._bucket_id(vec)
+            entry = [vec, top_k, documents]
+            self._buckets[bucket].append(entry)
+            self._order.append((bucket, entry))
+            if len(self._order) > self.max_entries:
+                old_bucket, old_entry = self._order.popleft()
+                try:
+                    self._buckets[old_bucket].remove(old_entry)
+                except ValueError:
+                    pass
+
+_support_query_cache = SemanticQueryCache()
+_release_query_cache = SemanticQueryCache()
+
+class ChromaQueryBatcher:
+    """
+    Coalesces concurrent vector-search calls into one batched Chroma query.
+
+    Chroma (and the Gemini embedding API behind it) handle a list of
+    queries in a single call far more cheaply than N separate calls —
+    one HTTP request and one HNSW batch instead of N. Callers submit
+    (query, top_k) and block on a Future; a background thread drains the
+    queue, waits up to MAX_WAIT for stragglers, and issues one query for
+    the whole batch.
+    """
+
+    MAX_BATCH = 32
+    MAX_WAIT = 0.005  # seconds to wait for more queries to coalesce
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._queue = queue.Queue()
+        worker = threading.Thread(target=self._run, daemon=True)
+        worker.start()
+
+    def submit(self, query: str, query_vec, top_k: int) -> Future:
+        future = Future()
+        self._queue.put((query, query_vec, top_k, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.MAX_WAIT
+            while len(batch) < self.MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._execute(batch)
+
+    def _execute(self, batch):
+        # Pre-embedded queries and text-only fallbacks need different
+        # keyword arguments, so run them as (at most) two Chroma calls
+        embedded = [item for item in batch if item[1] is not None]
+        text_only = [item for item in batch if item[1] is None]
+        for group in (embedded, text_only):
+            if not group:
+                continue
+            # Chroma applies one n_results to the whole batch: query with
+            # the max and slice each caller's share back down
+            n_results = max(item[2] for item in group)
+            try:
+                if group is embedded:
+                    results = self.collection.query(
+                        query_embeddings=[item[1].tolist() for item in group],
+                        n_results=n_results
+                    )
+                else:
+                    results = self.collection.query(
+                        query_texts=[item[0] for item in group],
+                        n_results=n_results
+                    )
+                for i, (_, _, top_k, future) in enumerate(group):
+                    future.set_result({
+                        'documents': [results['documents'][i][:top_k]],
+                        'metadatas': [results['metadatas'][i][:top_k]] if results['metadatas'] else None,
+                        'distances': [results['distances'][i][:top_k]]
+                    })
+            except Exception as e:
+                for item in group:
+                    item[3].set_exception(e)
+
+_support_batcher = ChromaQueryBatcher(support_collection) if support_collection is not None else None
+_release_batcher = ChromaQueryBatcher(release_collection) if release_collection is not None else None
+
+
+# LRU cache of query text -> embedding. Each miss is a ~50-200ms round
+# trip to Google's embedding API, so repeated queries should never
+# re-embed. Persisted to disk at shutdown so restarts come up warm.
+_EMBED_CACHE_PATH = Path('./chroma_db/embedding_cache.pkl')
+_EMBED_CACHE_MAX = 4096
+try:
+    with open(_EMBED_CACHE_PATH, 'rb') as f:
+        _EMBED_CACHE = pickle.load(f)
+except Exception:
+    _EMBED_CACHE = OrderedDict()
+_embed_cache_lock = threading.Lock()
+
+@atexit.register
+def _persist_embed_cache():
+    try:
+        _EMBED_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(_EMBED_CACHE_PATH, 'wb') as f:
+            with _embed_cache_lock:
+                pickle.dump(_EMBED_CACHE, f)
+    except Exception:
+        pass  # cache persistence is best-effort
+
+def _embed_query(query: str):
+    """Embed a query once so it can drive both the cache and Chroma."""
+    with _embed_cache_lock:
+        vec = _EMBED_CACHE.get(query)
+        if vec is not None:
+            _EMBED_CACHE.move_to_end(query)
+            return vec
+    try:
+        vec = np.asarray(google_ef([query])[0], dtype=np.float32)
+    except Exception:
+        return None  # fall back to letting Chroma embed internally
+    with _embed_cache_lock:
+        _EMBED_CACHE[query] = vec
+        while len(_EMBED_CACHE) > _EMBED_CACHE_MAX:
+            _EMBED_CACHE.popitem(last=False)
+    return vec
+
+def _warm_up_search_path():
+    """
+    Prime the cold-start costs at boot instead of on the first user query.
+
+    The first collection.query loads the HNSW index from disk and the
+    first embed call pays the TLS handshake to Google's API — several
+    hundred ms that would otherwise land on a user's critical path.
+    """
+    try:
+        _embed_query("warmup")  # TLS handshake + embedder warm-up
+        for collection in (support_collection, release_collection):
+            if collection is not None:
+                collection.query(query_texts=["warmup"], n_results=1)  # HNSW load
+        print("[OK] Search path warmed (HNSW index + embedder)")
+    except Exception as e:
+        print(f"Warning: search warm-up failed (will warm on first query): {e}")
+
+# Run in the background so boot isn't blocked if the embedding API is slow
+threading.Thread(target=_warm_up_search_path, daemon=True).start()
+
+def _package_documents(results) -> list:
+    """
+    Turn a Chroma result set into the documents list the tools return.
+
+    The distance->similarity conversion is vectorized with NumPy rather
+    than computed per-document in the Python loop; if re-ranking (MMR,
+    score blending) lands here later, the math stays a single array
+    expression instead of a hot scalar loop.
+    """
+    if not results['documents'] or len(results['documents']) == 0:
+        return []
+    docs = results['documents'][0]
+    sims = 1.0 - np.asarray(results['distances'][0], dtype=np.float32)
+    metas = results['metadatas'][0] if results['metadatas'] else [{}] * len(docs)
+    return [
+        {
+            "content": doc,
+            "metadata": metas[i],
+            "similarity_score": float(sims[i])  # distance -> similarity
+        }
+        for i, doc in enumerate(docs)
+    ]
+
 def search_support_docs(query: str = "", top_k: int = 3, **kwargs) -> dict:
     """
     Tool: Semantic search over support documentation
@@ -188,34 +619,36 @@ def search_support_docs(query: str = "", top_k: int = 3, **kwargs) -> dict:
         return {"success": False, "error": "Support docs collection not initialized"}
     
     try:
-        # This is where the vector search happens
-        # query_texts: converts query to vector automatically
-        # n_results: how many similar docs to return
-        results = support_collection.query(
-            query_texts=[query],
-            n_results=top_k
-        )
-        
+        # Embed the query once ourselves: the vector drives the semantic
+        # cache lookup AND gets passed straight to Chroma (no double embed)
+        query_vec = _embed_query(query)
+        if query_vec is not None:
+            cached_docs = _support_query_cache.get(query_vec, top_k)
+            if cached_docs is not None:
+                # Fresh envelope: the hit must echo THIS caller's query,
+                # not the paraphrase that populated the cache
+                return {"success": True, "documents": cached_docs, "query": query}
+
+        # This is where the vector search happens. Concurrent calls are
+        # coalesced by the batcher into a single multi-query Chroma call.
+        results = _support_batcher.submit(query, query_vec, top_k).result(timeout=30)
+
         # results structure:
         # - ids: document IDs
         # - documents: actual text content
         # - distances: how "far" each doc is from query (lower = more similar)
         # - metadatas: extra info about each doc
         
-        documents = []
-        if results['documents'] and len(results['documents']) > 0:
-            for i, doc in enumerate(results['documents'][0]):
-                documents.append({
-                    "content": doc,
-                    "metadata": results['metadatas'][0][i] if results['metadatas'] else {},
-                    "similarity_score": 1 - results['distances'][0][i]  # Convert distance to similarity
-                })
-        
-        return {
+        documents = _package_documents(results)
+
+        response = {
             "success": True,
             "documents": documents,
             "query": query
         }
+        if query_vec is not None:
+            _support_query_cache.put(query_vec, top_k, documents)
+        return response
     except Exception as e:
         return {
             "success": False,
@@ -231,25 +664,66 @@ def search_release_notes(query: str = "", top_k: int = 3, **kwargs) -> dict:
         return {"success": False, "error": "Release notes collection not initialized"}
     
     try:
-        results = release_collection.query(
-            query_texts=[query],
-            n_results=top_k
-        )
-        
-        documents = []
-        if results['documents'] and len(results['documents']) > 0:
-            for i, doc in enumerate(results['documents'][0]):
-                documents.append({
-                    "content": doc,
-                    "metadata": results['metadatas'][0][i] if results['metadatas'] else {},
-                    "similarity_score": 1 - results['distances'][0][i]
-                })
-        
-        return {
+        query_vec = _embed_query(query)
+        if query_vec is not None:
+            cached_docs = _release_query_cache.get(query_vec, top_k)
+            if cached_docs is not None:
+                return {"success": True, "documents": cached_docs, "query": query}
+
+        results = _release_batcher.submit(query, query_vec, top_k).result(timeout=30)
+
+        documents = _package_documents(results)
+
+        response = {
             "success": True,
             "documents": documents,
             "query": query
         }
+        if query_vec is not None:
+            _release_query_cache.put(query_vec, top_k, documents)
+        return response
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+def bulk_index_docs(docs: list = None, collection: str = "support_docs", batch_size: int = 200, **kwargs) -> dict:
+    """
+    Tool: Index documents into a vector collection in batches
+
+    Adding documents one at a time costs one embedding HTTP round trip
+    and one HNSW insert batch per document. Batching N docs into a single
+    collection.add call lets Chroma and the Gemini embedding API amortize
+    that to ~N/batch_size round trips.
+
+    INPUT: {"docs": [{"id": "...", "text": "...", "meta": {...}}, ...]}
+    """
+    target = {"support_docs": support_collection, "release_notes": release_collection}.get(collection)
+    if target is None:
+        return {"success": False, "error": f"Unknown or uninitialized collection: {collection}"}
+    if not docs:
+        return {"success": False, "error": "No documents provided"}
+
+    try:
+        batch_size = max(1, min(int(batch_size), 250))
+        indexed = 0
+        for start in range(0, len(docs), batch_size):
+            chunk = docs[start:start + batch_size]
+            # meta is optional per doc; Chroma's validation rejects {}
+            # ("Expected metadata to be a non-empty dict") but accepts None
+            target.add(
+                ids=[str(d.get("id", f"bulk_{start + i}")) for i, d in enumerate(chunk)],
+                documents=[d["text"] for d in chunk],
+                metadatas=[d.get("meta") or None for d in chunk]
+            )
+            indexed += len(chunk)
+        return {
+            "success": True,
+            "indexed": indexed,
+            "collection": collection,
+            "batches": -(-len(docs) // batch_size)
+        }
     except Exception as e:
         return {
             "success": False,
@@ -277,6 +751,25 @@ TOOLS = [
             "required": ["query"]
         }
     },
+    {
+        "name": "execute_sql_parametrized",
+        "description": "Execute a SQL query with ? placeholders and a list of bound parameters. Prefer this over execute_sql when the same query shape is run with different values (e.g. \"SELECT * FROM tasks WHERE status = ?\" with params [\"failed\"]).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "SQL SELECT query using ? placeholders"
+                },
+                "params": {
+                    "type": "array",
+                    "description": "Values bound to the ? placeholders, in order",
+                    "items": {}
+                }
+            },
+            "required": ["query"]
+        }
+    },
     {
         "name": "get_database_schema",
         "description": "Get the database schema (tables, columns, types). Use this to understand what data is available before writing SQL queries.",
@@ -286,6 +779,30 @@ TOOLS = [
             "required": []
         }
     },
+    {
+        "name": "bulk_index_docs",
+        "description": "Index a batch of documents into a vector collection. Documents are embedded and added in batches of up to 250 per call to Chroma, instead of one round trip per document.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "docs": {
+                    "type": "array",
+                    "description": "Documents to index: [{\"id\": str, \"text\": str, \"meta\": object}, ...]",
+                    "items": {"type": "object"}
+                },
+                "collection": {
+                    "type": "string",
+                    "description": "Target collection: 'support_docs' or 'release_notes' (default: support_docs)"
+                },
+                "batch_size": {
+                    "type": "integer",
+                    "description": "Documents per Chroma add call (default: 200, max: 250)",
+                    "default": 200
+                }
+            },
+            "required": ["docs"]
+        }
+    },
     {
         "name": "search_support_docs",
         "description": "Search support documentation for troubleshooting and error resolution. Use this when users ask about errors, issues, or how to fix problems.",
@@ -326,9 +843,16 @@ TOOLS = [
     }
 ]
 
+# TOOLS never changes after import, so serialize it exactly once.
+# tools/list is hit on every cold agent build in the orchestrator; with
+# this the handler just splices pre-encoded bytes around the request id.
+_TOOLS_JSON = orjson.dumps({"tools": TOOLS})
+
 # Map tool names to actual Python functions
 TOOL_HANDLERS = {
     "execute_sql": execute_sql,
+    "execute_sql_parametrized": execute_sql_parametrized,
+    "bulk_index_docs": bulk_index_docs,
     "get_database_schema": get_database_schema,
     "search_support_docs": search_support_docs,
     "search_release_notes": search_release_notes
@@ -339,11 +863,59 @@ TOOL_HANDLERS = {
 # These implement the MCP protocol
 # ============================================================================
 
+def _rpc_error(code: int, message: str, request_id, status: int):
+    return _json_response({
+        "jsonrpc": "2.0",
+        "error": {
+            "code": code,
+            "message": message
+        },
+        "id": request_id
+    }, status=status)
+
+def _handle_tools_list(params, request_id):
+    # Return list of available tools
+    # LLM calls this first to discover what it can do.
+    # The tool list is static, so the body is pre-serialized bytes
+    # plus the caller's request id — effectively a memcpy.
+    body = (b'{"jsonrpc":"2.0","result":' + _TOOLS_JSON
+            + b',"id":' + orjson.dumps(request_id) + b'}')
+    return app.response_class(body, mimetype='application/json')
+
+def _handle_tools_call(params, request_id):
+    # Execute a specific tool
+    tool_name = params.get('name')
+    tool_args = params.get('arguments', {})
+
+    handler = TOOL_HANDLERS.get(tool_name)
+    if handler is None:
+        return _rpc_error(-32601, f"Tool not found: {tool_name}", request_id, 404)
+
+    # Execute the tool function
+    # This is where the actual work happens!
+    result = handler(**tool_args)
+
+    # Large SELECTs stream their JSON-RPC envelope chunk by chunk
+    if isinstance(result, StreamedSqlResult):
+        return app.response_class(result.response_body(request_id), mimetype='application/json')
+
+    return _json_response({
+        "jsonrpc": "2.0",
+        "result": result,
+        "id": request_id
+    })
+
+# Single dict lookup instead of an if/elif ladder over method strings
+METHOD_DISPATCH = {
+    'tools/list': _handle_tools_list,
+    'tools/call': _handle_tools_call,
+}
+
 @app.route('/mcp', methods=['POST'])
 def mcp_handler():
     """
     Main MCP endpoint - handles all JSON-RPC requests
-    
+
     JSON-RPC REQUEST FORMAT:
     {
         "jsonrpc": "2.0",
@@ -351,7 +923,7 @@ def mcp_handler():
         "params": {...},
         "id": 1
     }
-    
+
     RESPONSE FORMAT:
     {
         "jsonrpc": "2.0",
@@ -359,68 +931,25 @@ def mcp_handler():
         "id": 1
     }
     """
-    data = request.json
-    
-    # Validate JSON-RPC format
-    if 'jsonrpc' not in data or data['jsonrpc'] != '2.0':
-        return jsonify({
-            "jsonrpc": "2.0",
-            "error": {
-                "code": -32600,
-                "message": "Invalid Request: missing jsonrpc version"
-            },
-            "id": data.get('id')
-        }), 400
-    
-    method = data.get('method')
-    params = data.get('params', {})
+    # orjson parses the raw body directly (cache=False skips Flask's copy).
+    # Malformed bodies get a JSON-RPC error envelope, not an HTML 500.
+    try:
+        data = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        return _rpc_error(-32700, "Parse error: invalid JSON", None, 400)
+    if not isinstance(data, dict):
+        return _rpc_error(-32600, "Invalid Request: expected a JSON object", None, 400)
+
+    # Validate JSON-RPC format (single dict probe)
+    if data.get('jsonrpc') != '2.0':
+        return _rpc_error(-32600, "Invalid Request: missing jsonrpc version", data.get('id'), 400)
+
     request_id = data.get('id')
-    
-    # Handle different methods
-    if method == 'tools/list':
-        # Return list of available tools
-        # LLM calls this first to discover what it can do
-        return jsonify({
-            "jsonrpc": "2.0",
-            "result": {"tools": TOOLS},
-            "id": request_id
-        })
-    
-    elif method == 'tools/call':
-        # Execute a specific tool
-        tool_name = params.get('name')
-        tool_args = params.get('arguments', {})
-        
-        if tool_name not in TOOL_HANDLERS:
-            return jsonify({
-                "jsonrpc": "2.0",
-                "error": {
-                    "code": -32601,
-                    "message": f"Tool not found: {tool_name}"
-                },
-                "id": request_id
-            }), 404
-        
-        # Execute the tool function
-        # This is where the actual work happens!
-        handler = TOOL_HANDLERS[tool_name]
-        result = handler(**tool_args)
-        
-        return jsonify({
-            "jsonrpc": "2.0",
-            "result": result,
-            "id": request_id
-        })
-    
-    else:
-        return jsonify({
-            "jsonrpc": "2.0",
-            "error": {
-                "code": -32601,
-                "message": f"Method not found: {method}"
-            },
-            "id": request_id
-        }), 404
+    handler = METHOD_DISPATCH.get(data.get('method'))
+    if handler is None:
+        return _rpc_error(-32601, f"Method not found: {data.get('method')}", request_id, 404)
+
+    return handler(data.get('params', {}), request_id)
 
 @app.route('/health', methods=['GET'])
 def health():
@@ -440,4 +969,8 @@ if __name__ == '__main__':
     print(f"Endpoint: http://0.0.0.0:{port}/mcp")
     print(f"Protocol: JSON-RPC 2.0")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # Local development only — production runs under gunicorn (see
+    # Dockerfile.mcp). threaded=True so concurrent tool calls don't
+    # serialize; debug off to avoid the reloader double-importing and
+    # wiping the in-process caches.
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
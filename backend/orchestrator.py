@@ -1,17 +1,23 @@
-from flask import Flask, request, jsonify, Response, stream_with_context
-from flask_cors import CORS
+from quart import Quart, request, jsonify, Response
+import asyncio
+import hashlib
 import os
 import logging
 import time
+import httpx
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import threading
-import queue
+import types
+from itertools import count
 from collections import defaultdict
 from typing import Dict, List, Any
 import redis
+import redis.asyncio as aioredis
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.callbacks.base import BaseCallbackHandler
+from langchain.callbacks.base import AsyncCallbackHandler
 try:
     from langchain.agents import initialize_agent, AgentType
 except ImportError:
@@ -20,8 +26,19 @@ except ImportError:
 
 from langchain.tools import Tool
 
-app = Flask(__name__)
-CORS(app)
+# Quart = async Flask: same routing API, but handlers run on an event
+# loop so one slow Gemini/MCP round trip doesn't pin an OS thread while
+# other SSE sessions wait
+app = Quart(__name__)
+
+# Manual CORS headers — cheaper than the Flask-CORS extension and the
+# frontend is the only browser client
+@app.after_request
+async def _cors(resp):
+    resp.headers['Access-Control-Allow-Origin'] = '*'
+    resp.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    resp.headers['Access-Control-Allow-Methods'] = 'POST,OPTIONS,GET'
+    return resp
 
 logging.basicConfig(level=logging.INFO)
 
@@ -46,92 +63,270 @@ gemini_key = os.getenv("GEMINI_API_KEY")
 if not gemini_key:
     logging.warning("No GEMINI_API_KEY provided! The LangChain Agent may fail.")
 
-def call_mcp_tool(mcp_url: str, tool_name: str, arguments: dict):
-    """
-    Submits a JSON-RPC request to the target multi-tenant MCP server.
-    """
-    payload = {
+# Opt-in stdout tracing of agent steps (for local debugging only)
+AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "0") == "1"
+
+# One shared Session with a keep-alive pool: the ReAct loop makes 3-5
+# tool calls per user query, and a fresh TCP handshake per JSON-RPC call
+# is pure overhead
+MCP_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    # urllib3's default allowed_methods excludes POST, which is all this
+    # session sends; allowed_methods=None opts every method in. Safe
+    # here because the JSON-RPC calls are idempotent reads
+    max_retries=Retry(total=2, backoff_factor=0.1, allowed_methods=None)
+)
+MCP_SESSION.mount('http://', _adapter)
+MCP_SESSION.mount('https://', _adapter)
+
+# Async client for the hot tool-call path: keep-alive pool shared across
+# the whole process, and awaiting the POST frees the event loop while the
+# MCP server works. Transport-level retries cover transient connection
+# resets (e.g. the MCP container restarting) without surfacing as agent
+# errors. HTTP/2 would need TLS+ALPN the gunicorn MCP server doesn't
+# speak, so we stay on HTTP/1.1 keep-alive and widen the pool instead.
+# The limits must be passed to the transport itself: when a custom
+# transport is supplied, httpx ignores the client-level limits kwarg
+HTTP = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_connections=256, max_keepalive_connections=128)
+    ),
+    timeout=10
+)
+
+# Unique per-call JSON-RPC ids (instead of a hardcoded 1) so concurrent
+# calls multiplexed over one connection stay correlatable
+_rpc_id = count(1)
+
+def _tool_call_payload(tool_name: str, arguments: dict) -> bytes:
+    return orjson.dumps({
         "jsonrpc": "2.0",
         "method": "tools/call",
         "params": {
             "name": tool_name,
             "arguments": arguments
         },
-        "id": 1
-    }
+        "id": next(_rpc_id)
+    })
+
+async def acall_mcp_tool(mcp_url: str, tool_name: str, arguments: dict):
+    """
+    Submits a JSON-RPC request to the target multi-tenant MCP server,
+    without blocking the event loop while the call is in flight.
+
+    The response is read via httpx's streaming API, so large tool outputs
+    (schema dumps, big SQL result sets — the MCP server chunks those) are
+    consumed as they arrive instead of buffered by the transport first.
+    """
     try:
-        response = requests.post(mcp_url, json=payload, timeout=10)
-        return response.json()
+        async with HTTP.stream(
+            "POST",
+            mcp_url,
+            content=_tool_call_payload(tool_name, arguments),
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            data = await response.aread()
+        return orjson.loads(data)
     except Exception as e:
         return {"error": str(e)}
 
-# Global caches securely storing Agents per tenant
+def call_mcp_tool(mcp_url: str, tool_name: str, arguments: dict):
+    """
+    Synchronous fallback for contexts without an event loop (warm-up
+    thread, sync agent paths).
+    """
+    try:
+        # orjson serializes/parses noticeably faster than requests' stdlib json,
+        # and tool responses (SQL rows, doc chunks) can be large
+        response = MCP_SESSION.post(
+            mcp_url,
+            data=_tool_call_payload(tool_name, arguments),
+            headers={"Content-Type": "application/json"},
+            timeout=10
+        )
+        return orjson.loads(response.content)
+    except Exception as e:
+        return {"error": str(e)}
+
+# Global caches securely storing Agents per tenant.
+# Mutable during warm-up, then frozen to a MappingProxyType: /chat only
+# ever reads it, and a read-only mapping makes accidental runtime writes
+# raise loudly instead of silently mutating a hot shared dict.
 AGENT_CACHE: Dict[str, Any] = {}
 
-# Initialize Redis for Production-grade Session Management
+# Initialize Redis for Production-grade Session Management.
+# Two clients on purpose: the async one serves session I/O on the event
+# loop (a blocking GET would stall every in-flight SSE stream), while the
+# sync one backs code running in plain threads (warm-up, schema cache).
 try:
     REDIS_CLIENT = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"), decode_responses=True)
+    AREDIS_CLIENT = aioredis.from_url(
+        os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        decode_responses=True,
+        max_connections=128
+    )
 except:
     REDIS_CLIENT = None
+    AREDIS_CLIENT = None
+
+# Session memory lives in a Redis LIST (newest message first): LPUSH+LTRIM
+# keeps the rolling window server-side, so a save never has to fetch and
+# re-encode the whole history like the old GET/append/SET cycle did.
+SESSION_MEMORY_SIZE = 6
 
-def get_session_memory(session_id: str) -> List[Any]:
-    if not REDIS_CLIENT: return []
+async def get_session_memory(session_id: str) -> List[Any]:
+    if not AREDIS_CLIENT: return []
     try:
-        mem_str = REDIS_CLIENT.get(f"session:{session_id}")
-        return json.loads(str(mem_str)) if mem_str else []
+        items = await AREDIS_CLIENT.lrange(f"session:{session_id}", 0, SESSION_MEMORY_SIZE - 1)
+        # List is newest-first; callers expect chronological order
+        return [orjson.loads(m) for m in reversed(items)]
     except Exception as e:
         logging.error(f"Redis get error: {e}")
         return []
 
-def save_session_memory(session_id: str, new_messages: List[Any]):
-    if not REDIS_CLIENT: return
+async def save_session_memory(session_id: str, new_messages: List[Any]):
+    if not AREDIS_CLIENT: return
     try:
-        current = get_session_memory(session_id)
-        current.extend(new_messages)
-        # Keep only the last 6 messages
-        length = len(current)
-        if length > 6:
-            current = current[length-6:]
-        REDIS_CLIENT.set(f"session:{session_id}", json.dumps(current), ex=86400) # Expire in 24h
+        key = f"session:{session_id}"
+        # One pipelined round trip: push, trim to the window, refresh TTL.
+        # No MULTI/EXEC needed — an interleaved turn can at worst leave the
+        # list a couple of entries over the window until its own ltrim runs.
+        pipe = AREDIS_CLIENT.pipeline(transaction=False)
+        pipe.lpush(key, *[orjson.dumps(m) for m in new_messages])
+        pipe.ltrim(key, 0, SESSION_MEMORY_SIZE - 1)
+        pipe.expire(key, 86400)  # Expire in 24h
+        await pipe.execute()
     except Exception as e:
         logging.error(f"Redis set error: {e}")
 
-def discover_mcp_tools(mcp_url: str):
-    """
-    Dynamically asks the MCP server for its capabilities via 'tools/list'.
-    This means the orchestrator doesn't need to hardcode tool schemas!
-    """
+# Tool schemas change only on MCP server deploys, so cache them in Redis:
+# a cold orchestrator start rebuilds agents from the cached schema without
+# waiting on a tools/list round trip
+TOOLS_SCHEMA_TTL = 600  # seconds
+
+def _tools_schema_key(mcp_url: str) -> str:
+    return f"tools_schema:{hashlib.blake2b(mcp_url.encode(), digest_size=8).hexdigest()}"
+
+def _fetch_tool_schemas(mcp_url: str):
+    """Ask the MCP server for its tool schemas via 'tools/list'."""
     payload = {
         "jsonrpc": "2.0",
         "method": "tools/list",
         "params": {},
         "id": 1
     }
+    response = MCP_SESSION.post(
+        mcp_url,
+        data=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"},
+        timeout=10
+    )
+    return orjson.loads(response.content).get("result", {}).get("tools", [])
+
+def _refresh_tool_schemas(mcp_url: str):
+    """Background refresh so a cache hit never serves stale schemas for long."""
+    try:
+        schemas = _fetch_tool_schemas(mcp_url)
+        if schemas and REDIS_CLIENT:
+            REDIS_CLIENT.set(_tools_schema_key(mcp_url), orjson.dumps(schemas), ex=TOOLS_SCHEMA_TTL)
+    except Exception as e:
+        logging.warning(f"Tool schema refresh failed for {mcp_url}: {e}")
+
+def discover_mcp_tools(mcp_url: str):
+    """
+    Dynamically asks the MCP server for its capabilities via 'tools/list'.
+    This means the orchestrator doesn't need to hardcode tool schemas!
+
+    Schemas are cached in Redis (keyed on the MCP URL, 10 minute TTL) so
+    rebuilding an agent after a restart skips the HTTP round trip; hits
+    trigger an async refresh in the background.
+    """
     try:
-        response = requests.post(mcp_url, json=payload, timeout=10)
-        mcp_tools_data = response.json().get("result", {}).get("tools", [])
-        
+        mcp_tools_data = None
+        if REDIS_CLIENT:
+            try:
+                cached = REDIS_CLIENT.get(_tools_schema_key(mcp_url))
+                if cached:
+                    mcp_tools_data = orjson.loads(cached)
+                    threading.Thread(target=_refresh_tool_schemas, args=(mcp_url,), daemon=True).start()
+            except Exception as e:
+                logging.warning(f"Tool schema cache read failed: {e}")
+
+        if mcp_tools_data is None:
+            # Miss-storm guard for horizontally scaled replicas booting at
+            # once: SET NX elects one leader to do the HTTP fetch; losers
+            # briefly poll the cache before falling back to fetching.
+            lock_key = None
+            if REDIS_CLIENT:
+                lock_key = _tools_schema_key(mcp_url) + ":lock"
+                try:
+                    if not REDIS_CLIENT.set(lock_key, "1", nx=True, ex=10):
+                        for _ in range(20):
+                            time.sleep(0.1)
+                            cached = REDIS_CLIENT.get(_tools_schema_key(mcp_url))
+                            if cached:
+                                mcp_tools_data = orjson.loads(cached)
+                                break
+                except Exception as e:
+                    logging.warning(f"Tool schema lock failed: {e}")
+
+        if mcp_tools_data is None:
+            mcp_tools_data = _fetch_tool_schemas(mcp_url)
+            if mcp_tools_data and REDIS_CLIENT:
+                try:
+                    REDIS_CLIENT.set(_tools_schema_key(mcp_url), orjson.dumps(mcp_tools_data), ex=TOOLS_SCHEMA_TTL)
+                except Exception as e:
+                    logging.warning(f"Tool schema cache write failed: {e}")
+
         langchain_tools = []
         for mcp_tool in mcp_tools_data:
             tool_name = mcp_tool["name"]
             tool_desc = mcp_tool["description"]
-            
-            # Create a closure binding the specific tool name for LangChain
-            def make_tool_func(name):
+
+            # Create a closure binding the specific tool name for LangChain.
+            # The default argument name comes from the tool's own inputSchema
+            # (first declared property) instead of a hardcoded 'query'.
+            def make_tool_funcs(name, schema):
+                # Specialize the argument parser to the tool's schema shape
+                # once at discovery time, instead of re-deciding per call.
+                properties = schema.get("properties", {})
+                default_arg = next(iter(properties), "query")
+
+                if not properties:
+                    # No-argument tool (e.g. get_database_schema): whatever
+                    # string the LLM passes is noise — no parsing at all
+                    def _parse_args(arguments_str: str) -> dict:
+                        return {}
+                else:
+                    def _parse_args(arguments_str: str) -> dict:
+                        # Zero-Shot ReAct passes args usually as a single
+                        # string. If it's a JSON object, parse it with
+                        # orjson; otherwise bind the raw string to the
+                        # tool's first parameter.
+                        s = arguments_str.lstrip()
+                        if s[:1] == "{":
+                            try:
+                                return orjson.loads(s)
+                            except orjson.JSONDecodeError:
+                                pass
+                        return {default_arg: arguments_str}
+
                 def _func(arguments_str: str):
-                    # Zero-Shot ReAct passes args usually as a single string. 
-                    # If it's valid JSON, parse it, otherwise assign it to 'query' parameter
-                    try:
-                        args = json.loads(arguments_str) if arguments_str.strip().startswith("{") else {"query": arguments_str}
-                    except:
-                        args = {"query": arguments_str}
-                        
-                    return call_mcp_tool(mcp_url, name, args)
-                return _func
-                
+                    return call_mcp_tool(mcp_url, name, _parse_args(arguments_str))
+
+                async def _afunc(arguments_str: str):
+                    return await acall_mcp_tool(mcp_url, name, _parse_args(arguments_str))
+
+                return _func, _afunc
+
+            sync_func, async_func = make_tool_funcs(tool_name, mcp_tool.get("inputSchema", {}))
             langchain_tools.append(Tool(
                 name=tool_name,
-                func=make_tool_func(tool_name),
+                func=sync_func,
+                coroutine=async_func,  # ainvoke awaits this instead of blocking
                 description=tool_desc
             ))
             
@@ -141,35 +336,112 @@ def discover_mcp_tools(mcp_url: str):
         logging.error(f"Failed to discover tools: {e}")
         return []
 
-class StreamingCallbackHandler(BaseCallbackHandler):
-    def __init__(self, q):
+class StreamingCallbackHandler(AsyncCallbackHandler):
+    """
+    Forwards agent events onto a bounded queue for the SSE stream.
+
+    "thought" and "token" events are lossy telemetry: if a slow client
+    lets the queue fill up they get dropped rather than buffering an
+    unbounded backlog in memory. "observation", "final" and "error"
+    events always go through (awaited, so they apply backpressure).
+    """
+
+    def __init__(self, q: asyncio.Queue):
         self.q = q
 
-    def on_agent_action(self, action, **kwargs):
-        # The 'log' attribute contains the LLM's full thought text leading up to the action
-        thought_text = action.log.split("Action:")[0].replace("Thought:", "").strip()
-        self.q.put({
-            "type": "thought", 
-            "tool": action.tool, 
+    def _put_lossy(self, item):
+        try:
+            self.q.put_nowait(item)
+        except asyncio.QueueFull:
+            pass  # client is behind; drop cosmetic events
+
+    async def on_agent_action(self, action, **kwargs):
+        # The 'log' attribute contains the LLM's full thought text leading
+        # up to the action. partition() walks the string once and keeps
+        # just the head — no list allocation like split(), and the
+        # "Thought:" prefix is dropped by slicing instead of a full-string
+        # replace() pass.
+        head, _, _ = action.log.partition("Action:")
+        head = head.lstrip()
+        if head.startswith("Thought:"):
+            head = head[8:].lstrip()
+        thought_text = head.rstrip()
+        self._put_lossy({
+            "type": "thought",
+            "tool": action.tool,
             "tool_input": action.tool_input,
             "thought": thought_text
         })
 
-    def on_tool_end(self, output, **kwargs):
-        self.q.put({"type": "observation", "observation": str(output)})
+    async def on_tool_end(self, output, **kwargs):
+        await self.q.put({"type": "observation", "observation": str(output)})
+
+    async def on_llm_new_token(self, token, **kwargs):
+        # Stream tokens as generated so the UI shows text at time-to-first-
+        # token rather than waiting for the full answer; the final event
+        # still carries the authoritative output
+        self._put_lossy({"type": "token", "t": token})
+
+# The system prefix is ~1.5 KB of static protocol text; only the tenant
+# name varies. Rendering it once per tenant (instead of per request)
+# skips the f-string rebuild on every turn and — because the bytes are
+# identical across turns — lets Gemini's implicit context caching reuse
+# the already-processed prefix tokens.
+_SYSTEM_PREFIX_TEMPLATE = (
+    "You are a senior AI orchestrator for a Multi-Tenant SaaS platform. You handle data querying and documentation retrieval for '{tenant_id}'.\n\n"
+    "CORE OPERATIONAL PROTOCOLS:\n"
+    "1. MANDATORY INTENT CLASSIFICATION: Your VERY FIRST 'Thought' in EVERY response MUST start with: 'Intent Classification: <CATEGORY>'.\n"
+    "   Categories: [DATABASE_QUERY, DOCUMENTATION_SEARCH, SYSTEM_HEALTH_CHECK, CROSS_TENANT_ANALYSIS].\n"
+    "   Example: 'Thought: Intent Classification: DATABASE_QUERY. The user is asking for user counts.'\n\n"
+    "2. SQL TRANSPARENCY: When performing a DATABASE_QUERY, your 'Thought' MUST explicitly describe the SQL query you are about to run and why.\n\n"
+    "3. CATEGORY ISOLATION (STRICT):\n"
+    "   - If intent is DATABASE_QUERY: Use ONLY 'get_database_schema' and 'run_sql_query'. If you cannot find the answer in the database, DO NOT proceed to documentation. Instead, provide a 'Final Answer' explaining what you tried and ASKING the user if they want you to search support/release docs instead.\n"
+    "   - If intent is DOCUMENTATION_SEARCH: Use ONLY 'search_support_docs' and 'search_release_notes'. If you cannot find the answer, DO NOT try SQL. Provide a 'Final Answer' and ASK if you should query the database.\n"
+    "   - DO NOT automatically switch categories unless the user explicitly gave permission in the chat history.\n\n"
+    "4. SQL EXECUTION FLOW: Always call 'get_database_schema' once per session before running any 'run_sql_query'. Do not guess column names.\n"
+    "5. MULTI-TENANT: If the query involves multiple tenants, clearly state which tenant you are currently accessing in your thoughts.\n\n"
+    "You MUST follow the ReAct format precisely:\n"
+    "Thought: Intent Classification: <CATEGORY>. <Reasoning with explicit SQL logic if applicable>\n"
+    "Action: <tool_name>\n"
+    "Action Input: <tool_input>\n"
+    "Observation: <tool_output>\n"
+    "... (repeat if necessary)\n"
+    "Final Answer: <your natural language response to the user>\n"
+)
+
+SYSTEM_PREFIX_BY_TENANT: Dict[str, str] = {
+    tid: _SYSTEM_PREFIX_TEMPLATE.format(tenant_id=tid) for tid in TENANT_MCP_SERVERS
+}
 
-def get_or_create_agent(tenant_id: str, mcp_url: str, callbacks=None):
+def _system_prefix(tenant_id: str) -> str:
+    prefix = SYSTEM_PREFIX_BY_TENANT.get(tenant_id)
+    if prefix is None:
+        # Unknown tenant ids are rejected by /chat; this only covers
+        # tenants added to TENANT_MCP_SERVERS after import
+        prefix = SYSTEM_PREFIX_BY_TENANT.setdefault(
+            tenant_id, _SYSTEM_PREFIX_TEMPLATE.format(tenant_id=tenant_id)
+        )
+    return prefix
+
+def get_or_create_agent(tenant_id: str, mcp_url: str):
     """
     Fetches the cached Agent for the tenant, or builds it dynamically if it doesn't exist.
+
+    The AgentExecutor is always cached: initialize_agent re-renders tool
+    schemas and assembles the prompt, which is wasted work per request.
+    Request-specific callbacks are passed at invoke time via the config
+    dict ({"callbacks": [...]}), never baked into the executor.
     """
-    if tenant_id in AGENT_CACHE:
+    cached = AGENT_CACHE.get(tenant_id)
+    if cached is not None:
         logging.info(f"Using cached agent for tenant: {tenant_id}")
-        return AGENT_CACHE[tenant_id]
+        return cached
 
     logging.info(f"CACHE MISS for tenant: {tenant_id}. Creating new agent...")
     llm = ChatGoogleGenerativeAI(
         model="gemini-flash-latest",
         temperature=0,
+        streaming=True,  # emit on_llm_new_token callbacks as tokens arrive
         google_api_key=gemini_key
     )
 
@@ -181,43 +453,72 @@ def get_or_create_agent(tenant_id: str, mcp_url: str, callbacks=None):
         tools,
         llm,
         agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
-        verbose=True,
+        # verbose=True attaches a StdOutCallbackHandler that formats and
+        # prints every thought/observation; the frontend gets the same
+        # info via StreamingCallbackHandler, so only enable it on demand
+        verbose=AGENT_VERBOSE,
         max_iterations=20, # Increased from 10 to allow more complex reasoning
         early_stopping_method="generate",
         handle_parsing_errors=True,
         return_intermediate_steps=True
     )
     
-    # We don't cache the agent with callbacks because callbacks are per-request
-    if not callbacks:
+    try:
         AGENT_CACHE[tenant_id] = agent
+    except TypeError:
+        # Cache was frozen after warm-up; serve the one-off instance.
+        # This only happens for a tenant whose warm-up failed entirely.
+        logging.warning(f"AGENT_CACHE is frozen; serving uncached agent for {tenant_id}")
     return agent
 
+async def _warm_up_agents_async():
+    """
+    Warm all tenants concurrently: startup cost becomes max(latency)
+    across MCP servers instead of the sum. The semaphore bounds how many
+    discovery calls are in flight at once.
+    """
+    semaphore = asyncio.Semaphore(8)
+
+    async def warm(tenant_id: str, mcp_url: str):
+        async with semaphore:
+            try:
+                logging.info(f"Pre-initializing agent for {tenant_id}...")
+                # Agent construction (discovery HTTP + LLM setup) is sync,
+                # so run it on a worker thread and let gather overlap them
+                await asyncio.to_thread(get_or_create_agent, tenant_id, mcp_url)
+                logging.info(f"Successfully warmed up agent for {tenant_id}")
+            except Exception as e:
+                logging.error(f"Failed to warm up agent for {tenant_id}: {e}")
+
+    await asyncio.gather(*(warm(t, u) for t, u in TENANT_MCP_SERVERS.items()))
+
 def warm_up_agents():
     """
     Pre-initializes agents for all discovered tenants to avoid latency on the first query.
     """
+    global AGENT_CACHE
     logging.info("Warming up agents for all tenants...")
-    for tenant_id, mcp_url in TENANT_MCP_SERVERS.items():
-        try:
-            # Wait a few seconds for MCP servers to potentially finish booting (ChromaDB can be slow)
-            logging.info(f"Pre-initializing agent for {tenant_id}...")
-            get_or_create_agent(tenant_id, mcp_url)
-            logging.info(f"Successfully warmed up agent for {tenant_id}")
-        except Exception as e:
-            logging.error(f"Failed to warm up agent for {tenant_id}: {e}")
+    asyncio.run(_warm_up_agents_async())
+    # Read-mostly from here on: freeze the mapping so hot-path lookups hit
+    # an immutable dict and stray writes raise instead of racing readers
+    AGENT_CACHE = types.MappingProxyType(dict(AGENT_CACHE))
+
+# Warm up in the background at import time so it also runs under gunicorn
+# (which never executes the __main__ block). A failed warm-up just means
+# the first real request builds the agent via get_or_create_agent.
+threading.Thread(target=warm_up_agents, daemon=True).start()
 
 @app.route('/chat', methods=['POST', 'OPTIONS'])
-def chat():
+async def chat():
     """
     The Orchestrator Endpoint
-    Receives queries from the Frontend, determines the tenant context, 
+    Receives queries from the Frontend, determines the tenant context,
     and uses the LangChain LLM to orchestrate calls to the tenant's MCP server.
     """
     if request.method == 'OPTIONS':
         return jsonify({}), 200
 
-    data = request.json
+    data = await request.get_json()
     user_query = data.get('query', '')
     tenant_id = data.get('tenant_id', 'tenant_a')
     session_id = data.get('session_id', 'default_user_session')
@@ -228,71 +529,74 @@ def chat():
 
     logging.info(f"[{tenant_id} | Session: {session_id}] Query received: {user_query}")
     
-    def generate():
-        q = queue.Queue()
+    async def generate():
+        # Bounded: a verbose ReAct chain can't buffer megabytes behind a
+        # slow SSE consumer
+        q = asyncio.Queue(maxsize=64)
         handler = StreamingCallbackHandler(q)
-        
-        # We need a fresh agent instance to attach the request-specific callback
-        agent = get_or_create_agent(tenant_id, mcp_url, callbacks=[handler])
-        
-        history = get_session_memory(session_id)
+
+        # Shared executor; the request-specific callback rides along in
+        # the ainvoke config below
+        agent = get_or_create_agent(tenant_id, mcp_url)
+
+        history = await get_session_memory(session_id)
         history_text = "\n".join([f"{msg['role']}: {msg['text']}" for msg in history])
         context_prompt = f"\n\nRecent Chat History with User:\n{history_text}\n" if history else ""
 
-        system_prefix = (
-            f"You are a senior AI orchestrator for a Multi-Tenant SaaS platform. You handle data querying and documentation retrieval for '{tenant_id}'.\n\n"
-            "CORE OPERATIONAL PROTOCOLS:\n"
-            "1. MANDATORY INTENT CLASSIFICATION: Your VERY FIRST 'Thought' in EVERY response MUST start with: 'Intent Classification: <CATEGORY>'.\n"
-            "   Categories: [DATABASE_QUERY, DOCUMENTATION_SEARCH, SYSTEM_HEALTH_CHECK, CROSS_TENANT_ANALYSIS].\n"
-            "   Example: 'Thought: Intent Classification: DATABASE_QUERY. The user is asking for user counts.'\n\n"
-            "2. SQL TRANSPARENCY: When performing a DATABASE_QUERY, your 'Thought' MUST explicitly describe the SQL query you are about to run and why.\n\n"
-            "3. CATEGORY ISOLATION (STRICT):\n"
-            "   - If intent is DATABASE_QUERY: Use ONLY 'get_database_schema' and 'run_sql_query'. If you cannot find the answer in the database, DO NOT proceed to documentation. Instead, provide a 'Final Answer' explaining what you tried and ASKING the user if they want you to search support/release docs instead.\n"
-            "   - If intent is DOCUMENTATION_SEARCH: Use ONLY 'search_support_docs' and 'search_release_notes'. If you cannot find the answer, DO NOT try SQL. Provide a 'Final Answer' and ASK if you should query the database.\n"
-            "   - DO NOT automatically switch categories unless the user explicitly gave permission in the chat history.\n\n"
-            "4. SQL EXECUTION FLOW: Always call 'get_database_schema' once per session before running any 'run_sql_query'. Do not guess column names.\n"
-            "5. MULTI-TENANT: If the query involves multiple tenants, clearly state which tenant you are currently accessing in your thoughts.\n\n"
-            "You MUST follow the ReAct format precisely:\n"
-            "Thought: Intent Classification: <CATEGORY>. <Reasoning with explicit SQL logic if applicable>\n"
-            "Action: <tool_name>\n"
-            "Action Input: <tool_input>\n"
-            "Observation: <tool_output>\n"
-            "... (repeat if necessary)\n"
-            "Final Answer: <your natural language response to the user>\n"
-        )
-        
-        full_query = f"{system_prefix}{context_prompt}\n\nUser Question: {user_query}"
+        # Only the history delta is built per turn; the ~1.5 KB system
+        # prefix comes from the per-tenant cache byte-identical every time
+        full_query = f"{_system_prefix(tenant_id)}{context_prompt}\n\nUser Question: {user_query}"
 
-        def run_agent():
+        async def run_agent():
             try:
-                # Add callback to the agent call
-                result = agent.invoke({"input": full_query}, {"callbacks": [handler]})
+                # ainvoke keeps the event loop free while the LLM and MCP
+                # calls are in flight, so concurrent sessions overlap
+                result = await agent.ainvoke({"input": full_query}, {"callbacks": [handler]})
                 final_answer = result.get('output', '')
-                q.put({"type": "final", "output": final_answer})
-                
+                await q.put({"type": "final", "output": final_answer})
+
                 # 4. Save to Redis Session Memory for context in next turn
-                save_session_memory(session_id, [
+                await save_session_memory(session_id, [
                     {"role": "User", "text": user_query},
                     {"role": "AI", "text": final_answer}
                 ])
             except Exception as e:
                 logging.error(f"Agent error: {e}")
-                q.put({"type": "error", "message": str(e)})
+                await q.put({"type": "error", "message": str(e)})
             finally:
-                q.put(None)
+                await q.put(None)
 
-        threading.Thread(target=run_agent).start()
+        # A task on the running loop, not a thread: per-request OS threads
+        # (creation cost plus an 8 MB stack each) are gone from the hot
+        # path — the only threads left are import-time warm-up daemons
+        task = asyncio.create_task(run_agent())
 
-        while True:
-            item = q.get()
-            if item is None:
-                break
-            yield f"data: {json.dumps(item)}\n\n"
+        try:
+            while True:
+                item = await q.get()
+                if item is None:
+                    break
+                # orjson emits bytes directly — no separate UTF-8 encode
+                # before the socket write
+                yield b"data: " + orjson.dumps(item) + b"\n\n"
+        finally:
+            # A dropped SSE connection cancels generate() but not the
+            # agent task, which would run to completion and then block
+            # forever putting into the bounded queue nobody drains.
+            # Cancelling a finished task is a no-op.
+            task.cancel()
 
-    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response = Response(generate(), mimetype='text/event-stream')
+    # Quart wraps the whole response send in RESPONSE_TIMEOUT (60s by
+    # default) and silently drops the stream when it fires — far shorter
+    # than a full agent run (gunicorn is configured with --timeout 300
+    # for exactly that). Disable it for the SSE stream; the per-call
+    # httpx timeouts still bound the individual MCP/LLM hops.
+    response.timeout = None
+    return response
 
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     return jsonify({"status": "healthy", "service": "Central Orchestrator (LangChain Active)"})
 
 if __name__ == '__main__':
@@ -301,9 +605,8 @@ if __name__ == '__main__':
     print("LANGCHAIN ORCHESTRATOR STARTING")
     print(f"Simulating Multi-Tenant routing. Port: {port}")
     print("=" * 60)
-    
-    # Pre-initialize agents before taking traffic
-    warm_up_agents()
-    
-    # Disable debug mode in container to prevent reloader from wiping cache
+
+    # Local development only — production runs under gunicorn with a
+    # uvicorn worker (see Dockerfile.orchestrator). Debug mode stays off
+    # to prevent the reloader from wiping the agent cache.
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -17,13 +17,29 @@ WHY CHUNKING?
 - Sweet spot: 300-800 characters per chunk
 """
 
+import functools
+import hashlib
+import itertools
+import json
 import os
+import random
+import time
 import chromadb
+import numpy as np
 from chromadb.utils import embedding_functions
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import yaml
 from dotenv import load_dotenv
 
+# libyaml's C loader tokenizes 5-10x faster than the pure-Python
+# SafeLoader; fall back when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 load_dotenv()
 
 # ============================================================================
@@ -42,10 +58,39 @@ RELEASES_PATH = os.getenv("RELEASES_PATH", "./source_data/releases")
 CHUNK_SIZE = 500  # characters
 CHUNK_OVERLAP = 50  # characters to overlap between chunks (for continuity)
 
+# How many chunks to buffer before calling collection.add().
+# Batching across documents keeps the embedding endpoint and ChromaDB's
+# HNSW index fed even when individual docs are tiny; 128 sits inside
+# Chroma's recommended 50-250 window.
+BATCH_SIZE = 128
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Above ~1 MB, windowing over a UTF-8 bytes buffer beats str slicing:
+# each str slice copies UCS-4 code units, while a memoryview slice of
+# the encoded buffer is byte-for-byte and typically 4x smaller for
+# ASCII-heavy markdown
+LARGE_TEXT_BYTES = 1 << 20
+
+def _chunk_large(text: str, chunk_size: int, step: int):
+    """Bytes-level sliding window for multi-MB documents"""
+    buf = text.encode('utf-8')
+    mv = memoryview(buf)
+    chunks = []
+    for s in range(0, len(buf), step):
+        end = min(s + chunk_size, len(buf))
+        if end < len(buf):
+            # Back off to a UTF-8 sequence start so the window never
+            # ends mid-character (0b10xxxxxx marks continuation bytes)
+            while end > s and (buf[end] & 0xC0) == 0x80:
+                end -= 1
+        chunk = bytes(mv[s:end]).decode('utf-8', 'ignore').strip()
+        if len(chunk) > 100:
+            chunks.append(chunk)
+    return chunks
+
 def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP):
     """
     Split text into overlapping chunks
@@ -60,95 +105,417 @@ def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVE
     So both chunks contain the key transition.
     
     Java equivalent: sliding window algorithm
+
+    The window starts are a closed-form arithmetic progression, so
+    instead of a while loop advancing a cursor we slice straight from
+    range() — one .strip() per chunk (the loop version stripped twice).
     """
-    chunks = []
-    start = 0
-    
-    while start < len(text):
-        end = start + chunk_size
-        chunk = text[start:end]
-        
-        # Skip very small chunks (< 100 chars) at the end
-        if len(chunk.strip()) > 100:
-            chunks.append(chunk.strip())
-        
-        start += chunk_size - overlap  # Move window forward
-    
-    return chunks
+    # Strip the whole text once up front so leading/trailing whitespace
+    # doesn't shift window boundaries or produce empty tail windows
+    text = text.strip()
+    step = chunk_size - overlap
+    if len(text) >= LARGE_TEXT_BYTES:
+        return _chunk_large(text, chunk_size, step)
+    chunks = [text[s:s + chunk_size].strip() for s in range(0, len(text), step)]
+    # Skip very small chunks (< 100 chars) at the end
+    return [c for c in chunks if len(c) > 100]
+
+# File loading is I/O bound (read latency, not CPU), so a thread pool
+# overlaps the blocking reads — a big win when the docs directory is on
+# a network mount, a modest one on local SSD
+LOADER_WORKERS = 16
+
+def _map_bounded(fn, items, max_pending=LOADER_WORKERS):
+    """
+    Map fn over items with at most max_pending calls in flight.
+
+    Executor.map looks lazy but isn't: it submits every item up front
+    and buffers completed results internally no matter how slowly the
+    consumer iterates, so the whole corpus would sit in RAM anyway.
+    Keeping a bounded window of futures means memory holds only the
+    results the pipeline hasn't consumed yet. Yields in submission
+    order, same as map.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_pending) as ex:
+        window = deque(ex.submit(fn, item)
+                       for item in itertools.islice(items, max_pending))
+        while window:
+            yield window.popleft().result()
+            for item in itertools.islice(items, 1):
+                window.append(ex.submit(fn, item))
+
+def _list_files(directory: str, suffix: str):
+    """
+    List regular files with the given extension via os.scandir.
+
+    glob("*.md") routes every entry through fnmatch and stats it again;
+    scandir reuses the dirent type info from the listing itself, which
+    matters when each stat is a network round-trip (NAS-mounted docs).
+    """
+    with os.scandir(directory) as it:
+        return [Path(entry.path) for entry in it
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith(suffix)]
+
+def _load_markdown(md_file: Path):
+    """Worker: read one .md file into a document dict"""
+    return {
+        "content": md_file.read_text(encoding='utf-8'),
+        "metadata": {
+            "source": str(md_file.name),
+            "type": "support_doc"
+        }
+    }
 
 def load_markdown_files(directory: str):
-    """Load all .md files from directory"""
-    documents = []
+    """Yield documents from .md files as the worker threads finish reading them"""
     path = Path(directory)
-    
+
     if not path.exists():
         print(f"Warning: Directory not found: {directory}")
-        return documents
-    
-    for md_file in path.glob("*.md"):
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            documents.append({
-                "content": content,
-                "metadata": {
-                    "source": str(md_file.name),
-                    "type": "support_doc"
-                }
-            })
-    
-    return documents
+        return
+
+    yield from _map_bounded(_load_markdown, _list_files(directory, ".md"))
+
+def _load_yaml(yaml_file: Path):
+    """Worker: parse one .yaml file and render it as readable text"""
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=YamlLoader)
+
+    # Convert YAML to readable text format
+    # This makes embeddings more meaningful.
+    # One f-string per section with a joined generator for the items —
+    # same output bytes as the old append loop (the manifest hashes
+    # depend on that), without growing a list one line at a time.
+    content = (
+        f"Version: {data.get('version', 'Unknown')}\n"
+        f"Release Date: {data.get('release_date', 'Unknown')}\n"
+        f"\nSummary:\n{data.get('summary', '')}"
+    )
+
+    if 'features' in data:
+        content += "\n\nFeatures:" + "".join(
+            f"\n- {feature.get('name')}: {feature.get('description')}"
+            for feature in data['features'])
+
+    if 'bug_fixes' in data and data['bug_fixes']:
+        content += "\n\nBug Fixes:" + "".join(
+            f"\n- {fix.get('description')} (Severity: {fix.get('severity')})"
+            for fix in data['bug_fixes'])
+
+    if 'breaking_changes' in data and data['breaking_changes']:
+        content += "\n\nBreaking Changes:" + "".join(
+            f"\n- {change.get('change')}: {change.get('impact')}"
+            for change in data['breaking_changes'])
+
+    if 'deprecations' in data and data['deprecations']:
+        content += "\n\nDeprecations:" + "".join(
+            f"\n- {dep.get('feature')} (Deprecated in {dep.get('deprecated_in')})"
+            for dep in data['deprecations'])
+
+    return {
+        "content": content,
+        "metadata": {
+            "source": str(yaml_file.name),
+            "version": data.get('version', 'Unknown'),
+            "type": "release_note"
+        }
+    }
 
 def load_yaml_files(directory: str):
-    """Load all .yaml files from directory"""
-    documents = []
+    """Yield documents from .yaml files as the worker threads finish parsing them"""
     path = Path(directory)
-    
+
     if not path.exists():
         print(f"Warning: Directory not found: {directory}")
-        return documents
-    
-    for yaml_file in path.glob("*.yaml"):
-        with open(yaml_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            
-            # Convert YAML to readable text format
-            # This makes embeddings more meaningful
-            content_parts = []
-            content_parts.append(f"Version: {data.get('version', 'Unknown')}")
-            content_parts.append(f"Release Date: {data.get('release_date', 'Unknown')}")
-            content_parts.append(f"\nSummary:\n{data.get('summary', '')}")
-            
-            if 'features' in data:
-                content_parts.append("\nFeatures:")
-                for feature in data['features']:
-                    content_parts.append(f"- {feature.get('name')}: {feature.get('description')}")
-            
-            if 'bug_fixes' in data and data['bug_fixes']:
-                content_parts.append("\nBug Fixes:")
-                for fix in data['bug_fixes']:
-                    content_parts.append(f"- {fix.get('description')} (Severity: {fix.get('severity')})")
-            
-            if 'breaking_changes' in data and data['breaking_changes']:
-                content_parts.append("\nBreaking Changes:")
-                for change in data['breaking_changes']:
-                    content_parts.append(f"- {change.get('change')}: {change.get('impact')}")
-            
-            if 'deprecations' in data and data['deprecations']:
-                content_parts.append("\nDeprecations:")
-                for dep in data['deprecations']:
-                    content_parts.append(f"- {dep.get('feature')} (Deprecated in {dep.get('deprecated_in')})")
-            
-            content = "\n".join(content_parts)
-            documents.append({
-                "content": content,
-                "metadata": {
-                    "source": str(yaml_file.name),
-                    "version": data.get('version', 'Unknown'),
-                    "type": "release_note"
-                }
-            })
-    
-    return documents
+        return
+
+    yield from _map_bounded(_load_yaml, _list_files(directory, ".yaml"))
+
+# Gemini's batch embedding endpoint accepts up to 100 texts per request
+GEMINI_EMBED_BATCH = 100
+
+EMBED_MODEL = "models/gemini-embedding-001"
+
+@functools.cache
+def _genai():
+    """Configure and return the google.generativeai module on first use"""
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai
+
+def embed_texts(texts):
+    """
+    Embed a list of texts with ONE embed_content RPC.
+
+    Chroma's GoogleGenerativeAiEmbeddingFunction loops over its input
+    and issues one RPC per text, so handing it a batch still costs N
+    round trips. embed_content itself accepts a list of contents and
+    returns a list of vectors, which is the whole point of batching.
+    """
+    result = _genai().embed_content(
+        model=EMBED_MODEL,
+        content=list(texts),
+        task_type="RETRIEVAL_DOCUMENT"
+    )
+    return result["embedding"]
+
+# Rough per-request token budget: batches that blow past the model's
+# context cap get throttled or silently truncated, so pack below it
+MAX_TOKENS_PER_REQUEST = 20000
+
+def _estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose; close enough for packing
+    return len(text) // 4 + 1
+
+def pack_batches(texts, max_tokens: int = MAX_TOKENS_PER_REQUEST,
+                 max_items: int = GEMINI_EMBED_BATCH):
+    """Greedily pack texts into batches under both the token and item caps"""
+    buf, tokens = [], 0
+    for t in texts:
+        n = _estimate_tokens(t)
+        if buf and (tokens + n > max_tokens or len(buf) >= max_items):
+            yield buf
+            buf, tokens = [], 0
+        buf.append(t)
+        tokens += n
+    if buf:
+        yield buf
+
+# In-flight embedding RPCs: enough to hide the per-request round-trip,
+# small enough to stay under Gemini's queries-per-minute limits
+EMBED_WORKERS = 8
+_EMBED_POOL = ThreadPoolExecutor(max_workers=EMBED_WORKERS)
+
+def _embed_with_backoff(embed_fn, texts):
+    """
+    Call the embedding endpoint, retrying rate-limit errors with
+    exponential backoff (1s, 2s, 4s, ... plus jitter). Anything that
+    doesn't look like throttling is re-raised immediately.
+    """
+    for attempt in range(6):
+        try:
+            return embed_fn(texts)
+        except Exception as e:
+            msg = str(e).lower()
+            if "429" not in msg and "rate" not in msg and "quota" not in msg:
+                raise
+            delay = (2 ** attempt) + random.random()
+            print(f"  Embedding API throttled; retrying in {delay:.1f}s")
+            time.sleep(delay)
+    return embed_fn(texts)
+
+def flush_batch(collection, buf_ids, buf_docs, buf_metas, embed_fn=None,
+                add_pool=None, pending=None):
+    """
+    Send the buffered chunks to ChromaDB in one add() call and clear the buffers.
+
+    When embed_fn is given (embed_texts above), we call Gemini ourselves
+    with one RPC per token-packed sub-batch and pass the vectors via
+    embeddings= — Chroma's embedding-function wrapper would otherwise
+    embed item by item, one RPC per chunk.
+
+    When add_pool is given, the add() runs on that (single-worker)
+    executor so the HNSW insert of this batch overlaps the Gemini RPC
+    of the next one; callers collect the futures in `pending` and drain
+    them before querying the collection.
+    """
+    if not buf_ids:
+        return
+    ids, docs, metas = list(buf_ids), list(buf_docs), list(buf_metas)
+    buf_ids.clear()
+    buf_docs.clear()
+    buf_metas.clear()
+
+    embeddings = None
+    if embed_fn is not None:
+        # Identical chunks (boilerplate repeated across release notes,
+        # sliding-window artifacts) get embedded once; the vector is
+        # fanned back out to every duplicate position
+        hashes = [hashlib.blake2b(d.encode(), digest_size=16).digest() for d in docs]
+        unique_texts = {}
+        for h, d in zip(hashes, docs):
+            unique_texts.setdefault(h, d)
+        uniques = list(unique_texts.values())
+
+        # Fan the token-packed sub-batches out over the embed pool;
+        # map() preserves input order so vectors line up with the hashes
+        sub_batches = list(pack_batches(uniques))
+        vectors = []
+        for batch_vectors in _EMBED_POOL.map(lambda b: _embed_with_backoff(embed_fn, b), sub_batches):
+            vectors.extend(batch_vectors)
+
+        vector_by_hash = dict(zip(unique_texts.keys(), vectors))
+        # One contiguous float32 buffer instead of nested lists of
+        # 28-byte PyFloat boxes: ~4x smaller, and Chroma can hand the
+        # ndarray to its HNSW backend without per-element marshalling
+        embeddings = np.asarray([vector_by_hash[h] for h in hashes], dtype=np.float32)
+
+    if add_pool is not None:
+        pending.append(add_pool.submit(
+            collection.add, ids=ids, documents=docs, metadatas=metas, embeddings=embeddings
+        ))
+    else:
+        collection.add(ids=ids, documents=docs, metadatas=metas, embeddings=embeddings)
+
+def tune_chroma_sqlite(client):
+    """
+    Relax fsync behavior on ChromaDB's embedded SQLite for the bulk load.
+
+    Chroma's defaults pay a full fsync per transaction, which dominates
+    bulk-insert time; WAL + synchronous=NORMAL keeps durability while
+    batching the syncs. This reaches through a private attribute (stable
+    on the chromadb 0.4.x line pinned in requirements.txt), so any
+    failure is logged and ignored rather than breaking indexing.
+
+    Chroma's connection pool is per-thread and only journal_mode=WAL
+    persists in the database file — the other pragmas are connection
+    state. This must therefore run on every thread that touches SQLite;
+    in particular it is the add_pool worker's initializer, since that
+    thread does all the bulk writes.
+    """
+    try:
+        conn = client._server._sysdb._conn_pool.connect()
+        for pragma in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-200000",
+        ):
+            conn.execute(pragma)
+        print("Tuned ChromaDB SQLite pragmas for bulk insert")
+    except Exception as e:
+        print(f"Warning: could not tune ChromaDB SQLite pragmas: {e}")
+
+# Manifest of {collection: {source_filename: content_sha256}} from the
+# previous run. Unchanged files are skipped entirely — steady-state
+# re-runs cost a few hashes instead of a full re-embedding.
+MANIFEST_PATH = Path(CHROMA_PATH) / "manifest.json"
+
+def load_manifest():
+    """Read the previous run's content hashes (empty on first run)"""
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    """Persist content hashes for the next run's change detection"""
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+# HNSW params are fixed at creation time: cosine space to match the
+# embedding model, and a higher construction_ef so insert time stays
+# flat as the graph grows (the default trades build quality for
+# insert speed and degrades on incremental bulk loads)
+_HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 100,
+    "hnsw:M": 16
+}
+
+@functools.cache
+def get_embedding_function():
+    """
+    Build the Gemini embedding function on first use.
+
+    Constructing the wrapper validates the API key and primes an HTTP
+    session — wasted work on manifest-clean re-runs, so it is deferred
+    until a collection actually needs it (and cached after that).
+
+    This is the neural network that converts text → vectors.
+    Google's text-embedding-004 produces 768-dimensional vectors.
+    """
+    return embedding_functions.GoogleGenerativeAiEmbeddingFunction(
+        api_key=GEMINI_API_KEY,
+        model_name=EMBED_MODEL
+    )
+
+def build_collection(client, name, description, doc_iter,
+                     manifest, add_pool, doc_noun="documents"):
+    """
+    Incrementally (re)build one collection from a document iterator.
+
+    The whole ingestion pipeline lives here once — incremental manifest
+    skipping, streaming chunk buffers, batched/deduped embedding and
+    background adds — so every optimization applies to both collections
+    instead of being copy-pasted per pipeline.
+    """
+    google_ef = get_embedding_function()
+
+    # Reuse the existing collection instead of delete+recreate: the
+    # manifest tells us which files actually changed, so unchanged
+    # chunks stay in place and cost nothing.
+    # A collection is like a table in SQL - it groups related vectors
+    collection = client.get_or_create_collection(
+        name=name,
+        embedding_function=google_ef,
+        metadata={"description": description, **_HNSW_METADATA}
+    )
+
+    prev_hashes = manifest.get(name, {})
+    curr_hashes = {}
+    skipped = 0
+    pending = []
+
+    # Stream documents through the chunk buffer: the loader is a
+    # generator with a bounded read window, so memory stays at
+    # ~BATCH_SIZE chunks plus at most LOADER_WORKERS in-flight
+    # documents regardless of corpus size
+    total_docs = 0
+    total_chunks = 0
+    buf_ids, buf_docs, buf_metas = [], [], []
+    for doc in doc_iter:
+        total_docs += 1
+        source = doc['metadata']['source']
+        digest = hashlib.sha256(doc['content'].encode()).hexdigest()
+        curr_hashes[source] = digest
+        if prev_hashes.get(source) == digest:
+            skipped += 1
+            continue
+        if source in prev_hashes:
+            # Changed file: drop its old chunks before adding the new
+            # ones (chunk counts may differ, leaving stale high indices)
+            collection.delete(where={"source": source})
+
+        chunks = chunk_text(doc['content'])
+        n = len(chunks)
+        print(f"  {source}: {n} chunks")
+
+        # Build the document's ids and metadata in bulk rather than one
+        # append (and one doc['metadata'] lookup) per chunk
+        base_meta = doc['metadata']
+        buf_ids.extend(f"{source}_chunk{i}" for i in range(n))
+        buf_docs.extend(chunks)
+        buf_metas.extend(
+            {**base_meta, "chunk_index": i, "total_chunks": n} for i in range(n)
+        )
+        # Flush drains the whole buffer, so it may briefly run a few
+        # chunks past BATCH_SIZE — harmless, the packer re-splits anyway
+        if len(buf_ids) >= BATCH_SIZE:
+            flush_batch(collection, buf_ids, buf_docs, buf_metas, embed_texts,
+                        add_pool, pending)
+
+        total_chunks += n
+
+    flush_batch(collection, buf_ids, buf_docs, buf_metas, embed_texts, add_pool, pending)
+    # Drain the background adds so errors surface in this collection's
+    # section of the output, not the next one's
+    for f in pending:
+        f.result()
+
+    # Files deleted since the last run take their chunks with them
+    removed = [s for s in prev_hashes if s not in curr_hashes]
+    if removed:
+        collection.delete(where={"source": {"$in": removed}})
+        print(f"Removed chunks for {len(removed)} deleted files")
+    manifest[name] = curr_hashes
+
+    print(f"Loaded {total_docs} {doc_noun} ({skipped} unchanged, skipped)")
+    print(f"[OK] Embedded {total_chunks} chunks into {name} collection")
+    return collection
 
 # ============================================================================
 # EMBEDDING PIPELINE
@@ -169,15 +536,8 @@ def embed_documents():
     # Initialize ChromaDB client
     # PersistentClient saves data to disk (unlike Client which is in-memory only)
     client = chromadb.PersistentClient(path=CHROMA_PATH)
-    
-    # Create embedding function
-    # This is the neural network that converts text → vectors
-    # Google's text-embedding-004 produces 768-dimensional vectors
-    google_ef = embedding_functions.GoogleGenerativeAiEmbeddingFunction(
-        api_key=GEMINI_API_KEY,
-        model_name="models/gemini-embedding-001"
-    )
-    
+    tune_chroma_sqlite(client)
+
     print(f"\nUsing embedding model: gemini-embedding-001")
     print(f"ChromaDB storage: {CHROMA_PATH}")
     
@@ -188,52 +548,24 @@ def embed_documents():
     print("\n" + "-" * 60)
     print("EMBEDDING SUPPORT DOCUMENTS")
     print("-" * 60)
-    
-    # Delete existing collection if it exists (for clean setup)
-    try:
-        client.delete_collection("support_docs")
-        print("Deleted existing support_docs collection")
-    except:
-        pass
-    
-    # Create collection
-    # A collection is like a table in SQL - it groups related vectors
-    support_collection = client.create_collection(
-        name="support_docs",
-        embedding_function=google_ef,
-        metadata={"description": "Support documentation for troubleshooting"}
+
+    manifest = load_manifest()
+
+    # Single-worker pool for collection.add, shared by both builds: the
+    # HNSW insert of one batch (CPU/disk) runs while the main thread
+    # embeds the next batch (network). The initializer applies the
+    # SQLite pragma tuning to THIS thread's connection — the one that
+    # actually performs the bulk inserts (Chroma pools per thread)
+    add_pool = ThreadPoolExecutor(
+        max_workers=1, initializer=tune_chroma_sqlite, initargs=(client,)
     )
-    
-    # Load documents
-    support_docs = load_markdown_files(SUPPORT_DOCS_PATH)
-    print(f"Loaded {len(support_docs)} support documents")
-    
-    # Process each document
-    total_chunks = 0
-    for doc in support_docs:
-        # Split into chunks
-        chunks = chunk_text(doc['content'])
-        print(f"  {doc['metadata']['source']}: {len(chunks)} chunks")
-        
-        # Add to ChromaDB
-        # Note: We don't manually create embeddings here!
-        # ChromaDB uses the embedding_function to automatically generate vectors
-        for i, chunk in enumerate(chunks):
-            chunk_id = f"{doc['metadata']['source']}_chunk{i}"
-            support_collection.add(
-                ids=[chunk_id],
-                documents=[chunk],
-                metadatas=[{
-                    **doc['metadata'],
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                }]
-            )
-        
-        total_chunks += len(chunks)
-    
-    print(f"[OK] Embedded {total_chunks} chunks into support_docs collection")
-    
+
+    support_collection = build_collection(
+        client, "support_docs", "Support documentation for troubleshooting",
+        load_markdown_files(SUPPORT_DOCS_PATH), manifest, add_pool,
+        doc_noun="support documents"
+    )
+
     # ========================================================================
     # EMBED RELEASE NOTES
     # ========================================================================
@@ -242,44 +574,15 @@ def embed_documents():
     print("EMBEDDING RELEASE NOTES")
     print("-" * 60)
     
-    try:
-        client.delete_collection("release_notes")
-        print("Deleted existing release_notes collection")
-    except:
-        pass
-    
-    release_collection = client.create_collection(
-        name="release_notes",
-        embedding_function=google_ef,
-        metadata={"description": "Product release notes and version history"}
+    release_collection = build_collection(
+        client, "release_notes", "Product release notes and version history",
+        load_yaml_files(RELEASES_PATH), manifest, add_pool,
+        doc_noun="release notes"
     )
-    
-    # Load documents
-    release_docs = load_yaml_files(RELEASES_PATH)
-    print(f"Loaded {len(release_docs)} release notes")
-    
-    # Process each document
-    total_chunks = 0
-    for doc in release_docs:
-        chunks = chunk_text(doc['content'])
-        print(f"  {doc['metadata']['source']}: {len(chunks)} chunks")
-        
-        for i, chunk in enumerate(chunks):
-            chunk_id = f"{doc['metadata']['source']}_chunk{i}"
-            release_collection.add(
-                ids=[chunk_id],
-                documents=[chunk],
-                metadatas=[{
-                    **doc['metadata'],
-                    "chunk_index": i,
-                    "total_chunks": len(chunks)
-                }]
-            )
-        
-        total_chunks += len(chunks)
-    
-    print(f"[OK] Embedded {total_chunks} chunks into release_notes collection")
-    
+
+    add_pool.shutdown()
+    save_manifest(manifest)
+
     # ========================================================================
     # VERIFY EMBEDDINGS
     # ========================================================================